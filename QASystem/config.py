@@ -53,3 +53,15 @@ VERY_LARGE_FILE_THRESHOLD = 5 * 1024 * 1024  # 5MB
 
 # Pre-warm model on startup for faster first upload
 PREWARM_MODEL_ON_STARTUP = True
+
+# Background Ingestion Jobs
+INGESTION_WORKERS = 1  # Concurrent ingestions (one active document per namespace)
+MAX_PENDING_JOBS = 4  # Reject new uploads once this many jobs are queued or running
+JOB_HISTORY_LIMIT = 50  # Finished jobs kept for /jobs/{id} lookups
+STAGE_TIMEOUTS = {  # Per-stage time budget in seconds (enforced mid-call)
+    "clear": 60,
+    "convert": 300,
+    "split": 120,
+    "embed": 900,
+    "write": 300,
+}
@@ -8,8 +8,9 @@ from pathlib import Path
 import os
 import gc
 import psutil
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeout, as_completed
 from typing import List, Optional
 from dotenv import load_dotenv
 from QASystem.utils import pinecone_config
@@ -36,6 +37,84 @@ PINECONE_METADATA_LIMIT = 8000
 # Cache the embedder model to avoid reloading (significant speedup)
 _cached_embedder = None
 
+class IngestionCancelled(Exception):
+    """Raised when an ingestion job is cancelled between batches."""
+
+class IngestionStageTimeout(Exception):
+    """Raised when an ingestion stage runs past its time budget."""
+
+class IngestionControl:
+    """
+    Control hooks for a running ingestion.
+    Tracks the current stage, reports progress and raises at checkpoints
+    when the job was cancelled or the stage exceeded its timeout. Blocking
+    calls (conversion, embedding, vector store writes) go through call(),
+    so a hung call is abandoned at the deadline instead of holding the job.
+    """
+    
+    # How often a blocking call is interrupted to check cancel and timeout
+    POLL_SECONDS = 0.5
+    
+    def __init__(self, cancel_check=None, stage_timeouts=None, progress_callback=None):
+        self.cancel_check = cancel_check
+        self.stage_timeouts = stage_timeouts or {}
+        self.progress_callback = progress_callback
+        self.stage = None
+        self.stage_started = time.time()
+    
+    def enter_stage(self, stage: str, progress: int):
+        """Mark the start of a new stage and report progress."""
+        self.checkpoint()
+        self.stage = stage
+        self.stage_started = time.time()
+        self.report(progress)
+    
+    def report(self, progress: int):
+        """Forward progress to the callback, if any."""
+        if self.progress_callback:
+            self.progress_callback(progress, self.stage)
+    
+    def checkpoint(self):
+        """Raise if the job was cancelled or the current stage timed out."""
+        if self.cancel_check and self.cancel_check():
+            raise IngestionCancelled(f"Ingestion cancelled during {self.stage or 'startup'} stage")
+        timeout = self.stage_timeouts.get(self.stage)
+        if timeout:
+            elapsed = time.time() - self.stage_started
+            if elapsed > timeout:
+                raise IngestionStageTimeout(
+                    f"Stage '{self.stage}' exceeded its {timeout}s timeout ({elapsed:.0f}s elapsed)"
+                )
+    
+    def wait(self, future: Future):
+        """Result of future, raising as soon as the job is cancelled or the stage times out."""
+        while True:
+            self.checkpoint()
+            try:
+                return future.result(timeout=self.POLL_SECONDS)
+            except FutureTimeout:
+                continue
+    
+    def call(self, fn, *args, **kwargs):
+        """
+        Run a blocking call on a daemon thread and wait for it under the
+        stage deadline. A call that outlives the deadline or a cancel keeps
+        running in the background (threads can't be killed) but its result
+        is discarded.
+        """
+        future = Future()
+        
+        def target():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=target, name=f"ingest-{self.stage or 'call'}", daemon=True).start()
+        return self.wait(future)
+
 def get_memory_usage():
     """Get current memory usage in MB"""
     process = psutil.Process()
@@ -174,7 +253,8 @@ def get_converter_for_file(file_path):
     else:
         return None
 
-def process_chunks_parallel(chunks: List[Document], embedder, batch_size: int = 32) -> List[Document]:
+def process_chunks_parallel(chunks: List[Document], embedder, batch_size: int = 32,
+                            control: Optional[IngestionControl] = None) -> List[Document]:
     """Process chunks in parallel batches for faster embedding with comprehensive error handling"""
     embedded_chunks = []
     total_batches = (len(chunks) + batch_size - 1) // batch_size
@@ -192,6 +272,10 @@ def process_chunks_parallel(chunks: List[Document], embedder, batch_size: int =
             batch = chunks[i:i + batch_size]
             batch_num = (i // batch_size) + 1
             
+            # Honour cancellation and stage timeouts between batches
+            if control:
+                control.checkpoint()
+            
             # Monitor memory
             mem_before = get_memory_usage()
             
@@ -202,7 +286,7 @@ def process_chunks_parallel(chunks: List[Document], embedder, batch_size: int =
                     continue
                 
                 # Embed batch
-                result = embedder.run(documents=batch)
+                result = control.call(embedder.run, documents=batch) if control else embedder.run(documents=batch)
                 
                 if not result or 'documents' not in result:
                     raise Exception(f"Embedder returned invalid result for batch {batch_num}")
@@ -224,7 +308,12 @@ def process_chunks_parallel(chunks: List[Document], embedder, batch_size: int =
                 if batch_num % 3 == 0:
                     clear_memory()
                     print(f"   [GC] Memory cleanup: {get_memory_usage():.1f}MB")
+                
+                if control:
+                    control.report(50 + int(35 * batch_num / total_batches))
                     
+            except (IngestionCancelled, IngestionStageTimeout):
+                raise
             except Exception as batch_error:
                 error_msg = str(batch_error)
                 print(f"   [ERROR] Error in batch {batch_num}: {error_msg}")
@@ -246,11 +335,14 @@ def process_chunks_parallel(chunks: List[Document], embedder, batch_size: int =
         
         return embedded_chunks
         
+    except (IngestionCancelled, IngestionStageTimeout):
+        raise
     except Exception as e:
         print(f"   [FATAL] Error in parallel processing: {str(e)}")
         raise
 
-def ingest_document(file_path, document_store, clear_existing=True, max_pages=None, progress_callback=None):
+def ingest_document(file_path, document_store, clear_existing=True, max_pages=None, progress_callback=None,
+                    cancel_check=None, stage_timeouts=None):
     """
     Ingest a document into the vector store with parallel processing and memory management.
     
@@ -259,11 +351,18 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
         document_store: Pinecone document store instance
         clear_existing: Whether to clear existing documents first
         max_pages: Maximum pages to process (None = all pages)
-        progress_callback: Optional callback function for progress updates
+        progress_callback: Optional callback(progress, stage) for progress updates
+        cancel_check: Optional callable returning True when the job should stop
+        stage_timeouts: Optional {stage: seconds} budget per ingestion stage
     
     Returns:
         bool: True if successful, False otherwise
+    
+    Raises:
+        IngestionCancelled: If cancel_check fired between stages or batches
+        IngestionStageTimeout: If a stage ran past its timeout
     """
+    control = IngestionControl(cancel_check, stage_timeouts, progress_callback)
     try:
         # Validate inputs
         if not file_path:
@@ -285,13 +384,16 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
         start_time = time.time()
         
         # Clear existing documents COMPLETELY to avoid mixing different papers
+        control.enter_stage("clear", 15)
         if clear_existing:
             try:
                 load_dotenv()
                 pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
                 index = pc.Index("paperbot")
-                index.delete(delete_all=True, namespace="default")
+                control.call(index.delete, delete_all=True, namespace="default")
                 print("   [OK] Cleared existing documents from vector store")
+            except (IngestionCancelled, IngestionStageTimeout):
+                raise
             except Exception as e:
                 print(f"   [WARN] Error during cleanup: {e}")
                 print("   Continuing with ingestion...")
@@ -302,25 +404,28 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
         documents = []
         
         # Convert document to text
+        control.enter_stage("convert", 20)
         print(f"   [INFO] Converting {ext} file...")
         try:
             if ext in ['.docx', '.doc']:
-                documents = convert_docx_to_text(file_path)
+                documents = control.call(convert_docx_to_text, file_path)
             elif ext == '.csv':
-                documents = convert_csv_to_text(file_path)
+                documents = control.call(convert_csv_to_text, file_path)
             elif ext in ['.xlsx', '.xls']:
-                documents = convert_excel_to_text(file_path)
+                documents = control.call(convert_excel_to_text, file_path)
             elif ext == '.json':
-                documents = convert_json_to_text(file_path)
+                documents = control.call(convert_json_to_text, file_path)
             elif ext == '.md':
-                documents = convert_markdown_to_text(file_path)
+                documents = control.call(convert_markdown_to_text, file_path)
             elif converter:
                 # Use standard Haystack converter for PDF and TXT
-                result = converter.run(sources=[file_path_obj])
+                result = control.call(converter.run, sources=[file_path_obj])
                 documents = result['documents']
             else:
                 print(f"   [ERROR] Unsupported file type: {ext}")
                 return False
+        except (IngestionCancelled, IngestionStageTimeout):
+            raise
         except Exception as convert_error:
             print(f"   [ERROR] Error converting document: {convert_error}")
             import traceback
@@ -357,6 +462,7 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
             print(f"      Batch size: {batch_size} chunks")
         
         # Split documents into chunks
+        control.enter_stage("split", 40)
         print("   [INFO] Splitting into chunks...")
         try:
             splitter = DocumentSplitter(
@@ -386,12 +492,13 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
             return False
         
         # Embed chunks with parallel processing and memory management
+        control.enter_stage("embed", 50)
         print("   [INFO] Embedding chunks with parallel processing...")
         try:
             embedder = get_embedder()
             embedder.warm_up()
             
-            embedded_chunks = process_chunks_parallel(chunks, embedder, batch_size=batch_size)
+            embedded_chunks = process_chunks_parallel(chunks, embedder, batch_size=batch_size, control=control)
             
             # Validate embedding results
             if not embedded_chunks:
@@ -405,6 +512,8 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
             
             print(f"   [OK] Successfully embedded {len(embedded_chunks)} chunks")
             
+        except (IngestionCancelled, IngestionStageTimeout):
+            raise
         except Exception as embed_error:
             print(f"   [ERROR] Error embedding chunks: {embed_error}")
             import traceback
@@ -412,10 +521,11 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
             return False
         
         # Write to document store
+        control.enter_stage("write", 85)
         print("   [INFO] Writing to vector database...")
         try:
             writer = DocumentWriter(document_store, policy="UPSERT")
-            write_result = writer.run(documents=embedded_chunks)
+            write_result = control.call(writer.run, documents=embedded_chunks)
             chunks_written = write_result['documents_written']
             
             if chunks_written == 0:
@@ -423,6 +533,8 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
             
             print(f"   [OK] Wrote {chunks_written} chunks to Pinecone")
             
+        except (IngestionCancelled, IngestionStageTimeout):
+            raise
         except Exception as write_error:
             print(f"   [ERROR] Error writing to Pinecone: {str(write_error)}")
             print("   Check your Pinecone API key, index name, and network connection")
@@ -431,6 +543,7 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
             return False
         
         # Final memory cleanup
+        control.checkpoint()
         clear_memory()
         
         elapsed_time = time.time() - start_time
@@ -447,11 +560,15 @@ def ingest_document(file_path, document_store, clear_existing=True, max_pages=No
         print(f"   - Speed: {chunks_written/elapsed_time:.1f} chunks/sec")
         print(f"   - Memory used for this document: {memory_delta:+.1f}MB (baseline: {initial_memory:.1f}MB -> final: {final_memory:.1f}MB)")
         
-        if progress_callback:
-            progress_callback(100)
+        control.stage = "done"
+        control.report(100)
         
         return True
         
+    except (IngestionCancelled, IngestionStageTimeout) as stop:
+        print(f"\n[STOP] {stop}")
+        clear_memory()
+        raise
     except Exception as e:
         print(f"\n[CRITICAL] Error during ingestion: {str(e)}")
         print(f"   Error type: {type(e).__name__}")
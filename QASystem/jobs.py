@@ -0,0 +1,214 @@
+"""
+Background ingestion jobs for PaperBOT.
+Runs document ingestion in a bounded worker pool so upload requests return
+immediately with a job ID instead of blocking the event loop.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from QASystem.ingestion import ingest_document, IngestionCancelled, IngestionStageTimeout
+
+try:
+    from QASystem.config import INGESTION_WORKERS, MAX_PENDING_JOBS, JOB_HISTORY_LIMIT, STAGE_TIMEOUTS
+except ImportError:
+    INGESTION_WORKERS = 1
+    MAX_PENDING_JOBS = 4
+    JOB_HISTORY_LIMIT = 50
+    STAGE_TIMEOUTS = {}
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when too many ingestion jobs are already pending."""
+
+
+class IngestionJob:
+    """State of a single background ingestion."""
+
+    def __init__(self, file_path: str, filename: str, document_store_factory: Callable,
+                 on_queued: Optional[Callable] = None, on_start: Optional[Callable] = None,
+                 on_progress: Optional[Callable] = None, on_finish: Optional[Callable] = None):
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.filename = filename
+        self.document_store_factory = document_store_factory
+        self.on_queued = on_queued
+        self.on_start = on_start
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+
+        self.status = JOB_QUEUED
+        self.stage = None
+        self.progress = 0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def set_progress(self, progress: int, stage: Optional[str] = None):
+        self.progress = progress
+        if stage:
+            self.stage = stage
+        if self.on_progress:
+            self.on_progress(self)
+
+    def to_dict(self) -> dict:
+        """Serializable view of the job for the status API."""
+        elapsed = None
+        if self.started_at:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 1)
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "processing_time": elapsed,
+        }
+
+
+class IngestionJobManager:
+    """
+    Bounded worker pool for document ingestion.
+    Jobs can be cancelled while queued, or at any point once running.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = INGESTION_WORKERS,
+        max_pending: int = MAX_PENDING_JOBS,
+        history_limit: int = JOB_HISTORY_LIMIT,
+        stage_timeouts: Optional[Dict[str, float]] = None
+    ):
+        self.max_pending = max_pending
+        self.history_limit = history_limit
+        self.stage_timeouts = STAGE_TIMEOUTS if stage_timeouts is None else stage_timeouts
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, file_path: str, filename: str, document_store_factory: Callable, **callbacks) -> IngestionJob:
+        """
+        Queue a document for ingestion and return its job immediately.
+        Raises JobQueueFull if max_pending jobs are already queued or running.
+        """
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if not job.is_finished())
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} ingestion jobs already pending. Try again shortly.")
+
+            job = IngestionJob(file_path, filename, document_store_factory, **callbacks)
+            self._jobs[job.id] = job
+            self._prune_history()
+
+        # Run on_queued before the worker can pick the job up
+        if job.on_queued:
+            job.on_queued(job)
+        self._executor.submit(self._run, job)
+        print(f"[JOBS] Queued ingestion job {job.id} for {filename}")
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[dict]:
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation. Returns False if the job is unknown or already finished."""
+        job = self.get(job_id)
+        if job is None or job.is_finished():
+            return False
+        job.cancel_event.set()
+        print(f"[JOBS] Cancellation requested for job {job_id}")
+        return True
+
+    def shutdown(self, wait: bool = False):
+        """Cancel outstanding jobs and stop the worker pool."""
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.is_finished():
+                    job.cancel_event.set()
+        self._executor.shutdown(wait=wait)
+
+    def _prune_history(self):
+        """Drop the oldest finished jobs beyond history_limit (caller holds the lock)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished()]
+        for job_id in finished[:max(0, len(finished) - self.history_limit)]:
+            del self._jobs[job_id]
+
+    def _finish(self, job: IngestionJob, status: str, error: Optional[str] = None):
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        if status == JOB_COMPLETED:
+            job.progress = 100
+        if job.on_finish:
+            try:
+                job.on_finish(job)
+            except Exception as callback_error:
+                print(f"[JOBS] on_finish callback failed for job {job.id}: {callback_error}")
+
+    def _run(self, job: IngestionJob):
+        """Worker entry point: runs ingest_document for one job."""
+        if job.is_cancelled():
+            self._finish(job, JOB_CANCELLED, "Cancelled before start")
+            return
+
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        if job.on_start:
+            job.on_start(job)
+
+        try:
+            document_store = job.document_store_factory()
+            success = ingest_document(
+                job.file_path,
+                document_store,
+                clear_existing=True,
+                progress_callback=job.set_progress,
+                cancel_check=job.is_cancelled,
+                stage_timeouts=self.stage_timeouts
+            )
+            if success:
+                self._finish(job, JOB_COMPLETED)
+                print(f"[JOBS] Job {job.id} completed in {job.finished_at - job.started_at:.1f}s")
+            else:
+                self._finish(job, JOB_FAILED, "Document ingestion failed - check server logs for details")
+        except IngestionCancelled as cancelled:
+            self._finish(job, JOB_CANCELLED, str(cancelled))
+        except IngestionStageTimeout as timeout:
+            self._finish(job, JOB_FAILED, str(timeout))
+        except Exception as e:
+            print(f"[JOBS] Job {job.id} crashed: {e}")
+            import traceback
+            traceback.print_exc()
+            self._finish(job, JOB_FAILED, str(e))
+
+
+# Global job manager instance
+job_manager = IngestionJobManager()
@@ -35,15 +35,15 @@ import uvicorn
 import json
 import shutil
 from pathlib import Path
-import tempfile
 import asyncio
 import threading
 import time
 from QASystem.retrieval_and_generation import get_result
-from QASystem.ingestion import ingest_document, get_embedder
+from QASystem.ingestion import get_embedder
 from QASystem.utils import pinecone_config
-from QASystem.logger import log_info, log_error, log_warning, log_upload, log_query, log_request
+from QASystem.logger import log_info, log_error, log_warning, log_upload, log_query
 from QASystem.rate_limiter import check_rate_limit, get_client_ip, rate_limiter
+from QASystem.jobs import job_manager, JobQueueFull, JOB_COMPLETED, JOB_CANCELLED
 
 # File size limits - optimized for reasonable processing times
 # Recommended limits based on processing time:
@@ -61,7 +61,7 @@ DATA_DIR = Path("data")  # Preloaded files directory
 DATA_DIR.mkdir(exist_ok=True)
 
 # Global variable to track current document
-current_document = {"filename": None, "status": "No document uploaded", "progress": 0}
+current_document = {"filename": None, "status": "No document uploaded", "progress": 0, "job_id": None}
 
 # Model warmup status
 model_ready = {"status": False, "message": "Loading..."}
@@ -132,12 +132,77 @@ async def startup_event():
     thread.start()
     print("[INFO] Model warmup started in background...")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the ingestion worker pool"""
+    job_manager.shutdown(wait=False)
+
 # Configure templates
 templates = Jinja2Templates(directory="templates")
 
 # Supported file extensions
 ALLOWED_EXTENSIONS = [".pdf", ".docx", ".doc", ".txt", ".md", ".csv", ".json", ".xlsx", ".xls"]
 
+# ============================================================================
+# BACKGROUND INGESTION HELPERS
+# ============================================================================
+
+def _is_current_job(job) -> bool:
+    """Only the most recently submitted job may update current_document."""
+    return current_document.get("job_id") == job.id
+
+def _on_job_queued(job):
+    current_document["filename"] = job.filename
+    current_document["status"] = "Queued"
+    current_document["progress"] = 5
+    current_document["job_id"] = job.id
+
+def _on_job_start(job):
+    if _is_current_job(job):
+        current_document["status"] = "Processing..."
+        current_document["progress"] = 10
+
+def _on_job_progress(job):
+    if _is_current_job(job):
+        current_document["progress"] = job.progress
+
+def _on_job_finish(job, remove_file_on_failure: bool = True):
+    if job.status == JOB_COMPLETED:
+        log_upload(job.filename, Path(job.file_path).stat().st_size / (1024 * 1024), success=True)
+    else:
+        print(f"[ERROR] Ingestion job {job.id} {job.status}: {job.error}")
+        if remove_file_on_failure:
+            try:
+                Path(job.file_path).unlink(missing_ok=True)
+            except Exception:
+                pass
+
+    if not _is_current_job(job):
+        return
+    if job.status == JOB_COMPLETED:
+        current_document["status"] = "Ready"
+        current_document["progress"] = 100
+    else:
+        current_document["status"] = "Cancelled" if job.status == JOB_CANCELLED else "Failed"
+        current_document["progress"] = 0
+        current_document["filename"] = None
+
+def submit_ingestion_job(file_path: Path, filename: str, remove_file_on_failure: bool = True):
+    """
+    Queue a file for background ingestion and point current_document at it.
+    Raises JobQueueFull if the worker pool is saturated.
+    """
+    job = job_manager.submit(
+        str(file_path),
+        filename,
+        lambda: pinecone_config(namespace="default"),
+        on_queued=_on_job_queued,
+        on_start=_on_job_start,
+        on_progress=_on_job_progress,
+        on_finish=lambda finished: _on_job_finish(finished, remove_file_on_failure)
+    )
+    return job
+
 #creating the routes with bind functions
 @app.get("/")
 async def index(request: Request):
@@ -168,7 +233,7 @@ async def get_preloaded_files():
 
 @app.post("/load_preloaded_file")
 async def load_preloaded_file(request: Request):
-    """Load a file from the data folder"""
+    """Load a file from the data folder in the background. Returns a job ID to poll via /jobs/{job_id}."""
     global current_document
     
     try:
@@ -195,38 +260,19 @@ async def load_preloaded_file(request: Request):
         dest_path = UPLOADS_DIR / filename
         shutil.copy2(file_path, dest_path)
         
-        # Update status
-        current_document["filename"] = filename
-        current_document["status"] = "Processing..."
-        current_document["progress"] = 10
-        
-        # Process document
-        import time
-        start = time.time()
-        
-        current_document["progress"] = 30
-        document_store = pinecone_config(namespace="default")
-        
-        current_document["progress"] = 50
-        success = ingest_document(str(dest_path), document_store, clear_existing=True)
-        
-        if not success:
-            raise Exception("Document ingestion failed")
-        
-        current_document["progress"] = 90
-        elapsed = time.time() - start
-        
-        current_document["status"] = "Ready"
-        current_document["progress"] = 100
-        
-        print(f"[OK] Preloaded file ready: {filename} in {elapsed:.1f}s")
+        # Queue for background processing
+        try:
+            job = submit_ingestion_job(dest_path, filename, remove_file_on_failure=False)
+        except JobQueueFull as queue_error:
+            return JSONResponse(status_code=503, content={"success": False, "error": str(queue_error)})
         
-        return JSONResponse(content={
+        return JSONResponse(status_code=202, content={
             "success": True,
-            "message": f"File '{filename}' loaded and processed successfully!",
+            "message": f"File '{filename}' queued for processing",
+            "job_id": job.id,
+            "status": job.status,
             "filename": filename,
-            "size_mb": round(file_size_mb, 2),
-            "processing_time": round(elapsed, 1)
+            "size_mb": round(file_size_mb, 2)
         })
         
     except Exception as e:
@@ -631,7 +677,10 @@ async def test(request: Request):
     
 @app.post("/upload_document")
 async def upload_document(file: UploadFile = File(...)):
-    """Upload and process document with comprehensive error handling and size validation"""
+    """
+    Upload a document and queue it for background processing.
+    Returns immediately with a job ID; poll /jobs/{job_id} for progress.
+    """
     print(f"📥 Upload endpoint called - Filename: {file.filename}")
     
     # Variables for cleanup
@@ -730,73 +779,29 @@ async def upload_document(file: UploadFile = File(...)):
                 }
             )
         
-        # Update current document status
-        current_document["filename"] = file.filename
-        current_document["status"] = "Processing..."
-        current_document["progress"] = 10
-        
-        print(f"[INFO] Upload started: {file.filename} ({file_size_mb:.2f}MB)")
-        
-        # Process document synchronously (avoiding multiprocessing issues on Windows)
-        import time
-        start = time.time()
+        print(f"[INFO] Upload received: {file.filename} ({file_size_mb:.2f}MB)")
         
+        # Queue ingestion in the background so the event loop stays responsive
         try:
-            current_document["progress"] = 30
-            print("[INFO] Initializing document store...")
-            document_store = pinecone_config(namespace="default")
-            
-            current_document["progress"] = 50
-            print("[INFO] Processing document...")
-            
-            # Run ingestion with timeout to prevent indefinite hanging
-            success = ingest_document(str(final_file_path), document_store, clear_existing=True)
-            
-            if not success:
-                raise Exception("Document ingestion returned False - check server logs for details")
-            
-            current_document["progress"] = 90
-            elapsed = time.time() - start
-            print(f"[OK] Total processing time: {elapsed:.1f}s")
-            
-            current_document["status"] = "Ready"
-            current_document["progress"] = 100
-            print(f"[OK] Upload completed: {file.filename}")
-            
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "success": True, 
-                    "message": f"Document '{file.filename}' ({file_size_mb:.1f}MB) uploaded and processed successfully!",
-                    "filename": file.filename,
-                    "size_mb": round(file_size_mb, 2),
-                    "processing_time": round(elapsed, 1)
-                }
-            )
-            
-        except Exception as process_error:
-            print("[ERROR] Error processing document:", process_error)
-            import traceback
-            traceback.print_exc()
-            
-            # Cleanup on processing error
-            if final_file_path and final_file_path.exists():
-                try:
-                    final_file_path.unlink()
-                except:
-                    pass
-            
-            current_document["status"] = "Failed"
-            current_document["progress"] = 0
-            current_document["filename"] = None
-            
+            job = submit_ingestion_job(final_file_path, file.filename)
+        except JobQueueFull as queue_error:
+            final_file_path.unlink(missing_ok=True)
             return JSONResponse(
-                status_code=500,
-                content={
-                    "success": False,
-                    "error": f"Document processing failed: {str(process_error)}"
-                }
+                status_code=503,
+                content={"success": False, "error": str(queue_error)}
             )
+        
+        return JSONResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "message": f"Document '{file.filename}' ({file_size_mb:.1f}MB) uploaded and queued for processing",
+                "job_id": job.id,
+                "status": job.status,
+                "filename": file.filename,
+                "size_mb": round(file_size_mb, 2)
+            }
+        )
             
     except HTTPException as http_exc:
         # Re-raise HTTP exceptions
@@ -830,6 +835,29 @@ async def upload_document(file: UploadFile = File(...)):
 async def document_status():
     return current_document
 
+@app.get("/jobs", tags=["Documents"])
+async def list_jobs():
+    """List recent ingestion jobs, newest first"""
+    return {"jobs": job_manager.list_jobs()}
+
+@app.get("/jobs/{job_id}", tags=["Documents"])
+async def get_job(job_id: str):
+    """Get status, stage and progress of an ingestion job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"success": False, "error": f"Job not found: {job_id}"})
+    return job.to_dict()
+
+@app.post("/jobs/{job_id}/cancel", tags=["Documents"])
+async def cancel_job(job_id: str):
+    """Cancel a queued or running ingestion job (takes effect between batches)"""
+    if not job_manager.cancel(job_id):
+        return JSONResponse(
+            status_code=409,
+            content={"success": False, "error": "Job not found or already finished"}
+        )
+    return {"success": True, "message": "Cancellation requested", "job_id": job_id}
+
 @app.get("/preview_document")
 async def preview_document():
     """
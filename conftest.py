@@ -0,0 +1,27 @@
+"""
+Shared pytest fixtures for PaperBOT's unit tests.
+test_system.py and test_pinecone.py are interactive scripts (they run on
+import and need API keys), so pytest doesn't collect them.
+"""
+
+import pytest
+
+collect_ignore = ["test_system.py", "test_pinecone.py"]
+
+
+class FakeClock:
+    """Stands in for the time module in code that calls time.time()."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
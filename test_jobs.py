@@ -0,0 +1,149 @@
+"""Tests for background ingestion jobs (QASystem/jobs.py) and IngestionControl."""
+
+import threading
+
+import pytest
+
+from QASystem import jobs
+from QASystem.ingestion import IngestionCancelled, IngestionControl, IngestionStageTimeout
+from QASystem.jobs import (
+    IngestionJobManager, JobQueueFull,
+    JOB_CANCELLED, JOB_COMPLETED, JOB_FAILED, JOB_QUEUED,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(IngestionControl, "POLL_SECONDS", 0.01)
+
+
+@pytest.fixture
+def manager():
+    manager = IngestionJobManager(max_workers=1, max_pending=2, history_limit=5, stage_timeouts={})
+    yield manager
+    manager.shutdown(wait=True)
+
+
+def wait_finished(job, timeout=5):
+    done = threading.Event()
+    while not job.is_finished() and not done.wait(0.01):
+        timeout -= 0.01
+        assert timeout > 0, f"job still {job.status}"
+
+
+def test_job_runs_to_completion(manager, monkeypatch):
+    calls = []
+
+    def fake_ingest(file_path, document_store, progress_callback=None, **kwargs):
+        calls.append((file_path, document_store))
+        progress_callback(50, "embed")
+        return True
+
+    monkeypatch.setattr(jobs, "ingest_document", fake_ingest)
+    finished = []
+    job = manager.submit("/tmp/paper.pdf", "paper.pdf", lambda: "store", on_finish=finished.append)
+    wait_finished(job)
+
+    assert job.status == JOB_COMPLETED and job.progress == 100
+    assert job.stage == "embed"
+    assert calls == [("/tmp/paper.pdf", "store")]
+    assert finished == [job]
+    assert manager.list_jobs()[0]["job_id"] == job.id
+
+
+def test_failed_ingest_marks_job_failed(manager, monkeypatch):
+    monkeypatch.setattr(jobs, "ingest_document", lambda *args, **kwargs: False)
+    job = manager.submit("/tmp/paper.pdf", "paper.pdf", lambda: None)
+    wait_finished(job)
+    assert job.status == JOB_FAILED
+
+
+def test_queue_full_rejects_submit(manager, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(jobs, "ingest_document", lambda *args, **kwargs: release.wait(5))
+
+    first = manager.submit("/tmp/a.pdf", "a.pdf", lambda: None)
+    second = manager.submit("/tmp/b.pdf", "b.pdf", lambda: None)
+    with pytest.raises(JobQueueFull):
+        manager.submit("/tmp/c.pdf", "c.pdf", lambda: None)
+
+    release.set()
+    wait_finished(first)
+    wait_finished(second)
+    # Slots free up once jobs finish
+    wait_finished(manager.submit("/tmp/c.pdf", "c.pdf", lambda: None))
+
+
+def test_cancel_queued_job_never_runs(manager, monkeypatch):
+    release = threading.Event()
+    started = []
+
+    def fake_ingest(file_path, *args, **kwargs):
+        started.append(file_path)
+        return release.wait(5)
+
+    monkeypatch.setattr(jobs, "ingest_document", fake_ingest)
+    running = manager.submit("/tmp/a.pdf", "a.pdf", lambda: None)
+    queued = manager.submit("/tmp/b.pdf", "b.pdf", lambda: None)
+    assert queued.status == JOB_QUEUED
+
+    assert manager.cancel(queued.id)
+    release.set()
+    wait_finished(running)
+    wait_finished(queued)
+
+    assert queued.status == JOB_CANCELLED
+    assert started == ["/tmp/a.pdf"]
+    assert not manager.cancel(queued.id)
+    assert not manager.cancel("unknown")
+
+
+def test_cancel_interrupts_hung_call(manager, monkeypatch):
+    hang = threading.Event()
+
+    def fake_ingest(file_path, document_store, cancel_check=None, stage_timeouts=None, **kwargs):
+        control = IngestionControl(cancel_check, stage_timeouts)
+        control.enter_stage("write", 85)
+        control.call(hang.wait, 30)
+        return True
+
+    monkeypatch.setattr(jobs, "ingest_document", fake_ingest)
+    job = manager.submit("/tmp/a.pdf", "a.pdf", lambda: None)
+    while job.stage != "write":
+        threading.Event().wait(0.01)
+
+    assert manager.cancel(job.id)
+    wait_finished(job)
+    hang.set()
+    assert job.status == JOB_CANCELLED
+
+
+def test_stage_timeout_interrupts_hung_call():
+    hang = threading.Event()
+    control = IngestionControl(stage_timeouts={"convert": 0.05})
+    control.enter_stage("convert", 20)
+
+    with pytest.raises(IngestionStageTimeout):
+        control.call(hang.wait, 30)
+    hang.set()
+
+
+def test_call_returns_result_and_propagates_errors():
+    control = IngestionControl(stage_timeouts={"embed": 5})
+    control.enter_stage("embed", 50)
+    assert control.call(lambda x, y=0: x + y, 1, y=2) == 3
+
+    def boom():
+        raise ValueError("bad batch")
+
+    with pytest.raises(ValueError):
+        control.call(boom)
+
+
+def test_checkpoint_raises_when_cancelled():
+    cancelled = threading.Event()
+    control = IngestionControl(cancel_check=cancelled.is_set)
+    control.checkpoint()
+    cancelled.set()
+    with pytest.raises(IngestionCancelled):
+        control.enter_stage("split", 40)